@@ -2,6 +2,9 @@
 from fastapi import FastAPI, UploadFile, File, HTTPException
 from fastapi.responses import JSONResponse
 from typing import List
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import threading
 import time
 
 from src.api.schemas import (
@@ -9,25 +12,46 @@ from src.api.schemas import (
     IngestionResponse, HealthResponse
 )
 from src.data.document_loader import DocumentLoader
+from src.data.pdf_extraction import PdfExtractor
 from src.data.chunking import TextChunker
+from src.data.deduplication import NearDuplicateDetector
 from src.core.embedding_service import EmbeddingService
 from src.vector_store.retrieval import RetrievalService
 from src.core.llm_service import LlamaService
+from src.core.load_shedding import AdmissionController
 from src.core.config import Config
 
 # Initialize services
 config = Config()
-document_loader = DocumentLoader()
+document_loader = DocumentLoader(
+    pdf_extractor=PdfExtractor(
+        cache_dir=config.PDF_CACHE_DIR,
+        max_workers=config.PDF_EXTRACTION_WORKERS,
+        pages_per_task=config.PDF_PAGES_PER_TASK
+    )
+)
 text_chunker = TextChunker(
     chunk_size=config.CHUNK_SIZE,
     chunk_overlap=config.CHUNK_OVERLAP
 )
+duplicate_detector = NearDuplicateDetector(
+    threshold=config.DEDUP_THRESHOLD,
+    num_perm=config.DEDUP_NUM_PERM,
+    bands=config.DEDUP_BANDS
+)
 embedding_service = EmbeddingService(config.EMBEDDING_MODEL)
 retrieval_service = RetrievalService(config)
 llama_service = LlamaService(
     api_key=config.LLAMA_API_KEY,
     api_url=config.LLAMA_API_URL
 )
+admission_controller = AdmissionController(
+    max_in_flight=config.MAX_IN_FLIGHT_QUERIES,
+    degrade_in_flight=config.DEGRADE_IN_FLIGHT_QUERIES
+)
+# One thread per admission slot, so abandoned LLM calls can't starve the
+# default executor used for retrieval
+llm_executor = ThreadPoolExecutor(max_workers=config.MAX_IN_FLIGHT_QUERIES)
 
 app = FastAPI(
     title="Customer Support RAG Bot API",
@@ -38,6 +62,7 @@ app = FastAPI(
 # In-memory storage for demo (conceptual)
 # In production, this would be a database
 document_store = []
+ingest_lock = threading.Lock()
 
 @app.get("/health", response_model=HealthResponse)
 async def health_check():
@@ -48,6 +73,93 @@ async def health_check():
         model_loaded=embedding_service.model is not None
     )
 
+def _ingest_file(file_obj, filename: str):
+    """
+    Load, chunk, deduplicate, embed and store one uploaded file.
+    
+    Runs in a worker thread: every step here is blocking. Ingests are
+    serialized, since a deduplication batch stays pending until the vector
+    store has been updated. Returns (document id, chunks created,
+    duplicates skipped).
+    """
+    with ingest_lock:
+        # Load and chunk document; PDF pages are streamed to the chunker
+        pages = document_loader.load_pages_from_bytes(
+            file_obj, filename
+        )
+        chunk_pages = list(text_chunker.chunk_pages(pages))
+        chunks = [chunk for chunk, _ in chunk_pages]
+        
+        # Prepare chunk records
+        chunk_records = []
+        for i, (chunk, page_numbers) in enumerate(chunk_pages):
+            metadata = {
+                "text": chunk,
+                "source": filename,
+                "chunk_index": i
+            }
+            if page_numbers:
+                metadata["page_start"] = page_numbers[0]
+                metadata["page_end"] = page_numbers[-1]
+            chunk_records.append({
+                "id": f"{filename}_chunk_{i}",
+                "text": chunk,
+                "metadata": metadata
+            })
+        
+        # Skip near-duplicates of chunks that are already indexed
+        to_store, duplicates, stale_ids = chunk_records, {}, []
+        if config.DEDUP_ENABLED:
+            to_store, duplicates, stale_ids = duplicate_detector.deduplicate(chunk_records)
+        
+        try:
+            # Generate embeddings
+            embeddings = embedding_service.generate_embeddings([record["text"] for record in to_store])
+            
+            # Prepare vectors for Pinecone
+            vectors = []
+            for record, embedding in zip(to_store, embeddings):
+                vectors.append({
+                    "id": record["id"],
+                    "values": embedding,
+                    "metadata": record["metadata"]
+                })
+            
+            # Store in vector database; chunks that became duplicates are removed
+            if vectors and not retrieval_service.vector_store.upsert_vectors(vectors):
+                raise Exception("Vector store rejected the upsert")
+            if stale_ids and not retrieval_service.vector_store.delete_vectors(stale_ids):
+                raise Exception("Vector store rejected the delete")
+        except Exception:
+            # Nothing new is indexed, so the detector must not treat it as such
+            if config.DEDUP_ENABLED:
+                duplicate_detector.rollback()
+            raise
+        
+        if config.DEDUP_ENABLED:
+            duplicate_detector.commit()
+        
+        # Only this upload's chunks count as skipped; re-checked duplicates
+        # from earlier uploads belong to their own documents
+        upload_ids = {record["id"] for record in chunk_records}
+        skipped = {
+            chunk_id: canonical
+            for chunk_id, canonical in duplicates.items()
+            if chunk_id in upload_ids
+        }
+        
+        # Store metadata locally for demo
+        document_store.append({
+            "filename": filename,
+            "chunks": len(chunks),
+            "duplicates": skipped,
+            "timestamp": time.time()
+        })
+        
+        document_id = f"doc_{len(document_store)}"
+    
+    return document_id, len(chunks), len(skipped)
+
 @app.post("/ingest", response_model=IngestionResponse)
 async def ingest_document(file: UploadFile = File(...)):
     """
@@ -67,46 +179,17 @@ async def ingest_document(file: UploadFile = File(...)):
         )
     
     try:
-        # Load document
-        document_content = document_loader.load_from_bytes(
-            file.file, file.filename
+        # Keep the event loop free for queries while the file is processed
+        document_id, chunks_created, duplicates_skipped = await asyncio.to_thread(
+            _ingest_file, file.file, file.filename
         )
         
-        # Chunk document
-        chunks = text_chunker.chunk_document(document_content)
-        
-        # Generate embeddings
-        embeddings = embedding_service.generate_embeddings(chunks)
-        
-        # Prepare vectors for Pinecone
-        vectors = []
-        for i, (chunk, embedding) in enumerate(zip(chunks, embeddings)):
-            vector_id = f"{file.filename}_chunk_{i}"
-            vectors.append({
-                "id": vector_id,
-                "values": embedding,
-                "metadata": {
-                    "text": chunk,
-                    "source": file.filename,
-                    "chunk_index": i
-                }
-            })
-        
-        # Store in vector database (conceptual)
-        # In production: pinecone_service.upsert_vectors(vectors)
-        
-        # Store metadata locally for demo
-        document_store.append({
-            "filename": file.filename,
-            "chunks": len(chunks),
-            "timestamp": time.time()
-        })
-        
         processing_time = time.time() - start_time
         
         return IngestionResponse(
-            document_id=f"doc_{len(document_store)}",
-            chunks_created=len(chunks),
+            document_id=document_id,
+            chunks_created=chunks_created,
+            duplicates_skipped=duplicates_skipped,
             status="success"
         )
         
@@ -121,23 +204,64 @@ async def query_rag_system(request: QueryRequest):
     RUNNABLE: This demonstrates the complete RAG pipeline.
     """
     start_time = time.time()
+    deadline = start_time + (request.deadline_ms / 1000 if request.deadline_ms else config.QUERY_DEADLINE_SECONDS)
+    
+    # Shed load outright once too many queries are in flight
+    if not admission_controller.try_acquire():
+        raise HTTPException(
+            status_code=503,
+            detail="Service is overloaded, please retry shortly",
+            headers={"Retry-After": "1"}
+        )
+    
+    # Set once the LLM call owns the admission slot
+    slot_handed_off = False
     
     try:
-        # Step 1: Retrieve relevant context
-        context_chunks = retrieval_service.retrieve_relevant_context(
+        # Degrade up front if the LLM can't answer before the deadline
+        degraded_reason = admission_controller.degrade_reason(deadline - time.time())
+        top_k = request.top_k if request.top_k is not None else config.TOP_K_RESULTS
+        if degraded_reason is not None:
+            top_k = min(top_k, config.DEGRADED_TOP_K)
+        
+        # Step 1: Retrieve relevant context (off the event loop, so the
+        # sharded index's scatter-gather doesn't block other queries)
+        context_chunks = await asyncio.to_thread(
+            retrieval_service.retrieve_relevant_context,
             query=request.question,
-            top_k=request.top_k
+            top_k=top_k
         )
         
         # Extract text from context chunks
         context_texts = [chunk['text'] for chunk in context_chunks]
         sources = list(set([chunk['source'] for chunk in context_chunks]))
         
-        # Step 2: Generate response using LLM
-        answer = llama_service.generate_response(
-            user_query=request.question,
-            context=context_texts
-        )
+        # Step 2: Generate response using LLM, within the remaining budget
+        answer = None
+        if degraded_reason is None:
+            # The worker thread releases the slot when the LLM call finishes,
+            # so calls we stop waiting for still count as in flight
+            llm_future = asyncio.get_running_loop().run_in_executor(
+                llm_executor, _timed_generate_response, request.question, context_texts
+            )
+            slot_handed_off = True
+            try:
+                # shield() keeps a timeout from cancelling a call that hasn't
+                # started yet, which would leak its slot
+                answer = await asyncio.wait_for(
+                    asyncio.shield(llm_future),
+                    timeout=max(deadline - time.time(), 0)
+                )
+            except asyncio.TimeoutError:
+                degraded_reason = "deadline"
+                admission_controller.mark_degraded()
+        
+        # Degraded mode: answer from the retrieved chunks directly
+        if answer is None:
+            answer = llama_service.generate_extractive_response(
+                user_query=request.question,
+                context=context_texts
+            )
         
         # Calculate confidence (simplified)
         confidence = 0.0
@@ -150,11 +274,33 @@ async def query_rag_system(request: QueryRequest):
             answer=answer,
             sources=sources,
             confidence=confidence,
-            processing_time=processing_time
+            processing_time=processing_time,
+            degraded=degraded_reason is not None,
+            degraded_reason=degraded_reason
         )
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error processing query: {str(e)}")
+    finally:
+        if not slot_handed_off:
+            admission_controller.release()
+
+def _timed_generate_response(question: str, context_texts: List[str]) -> str:
+    """Call the LLM, then record its latency and free the admission slot.
+    
+    Runs in a worker thread and finishes even if the request already gave
+    up waiting, so slow backends still push later queries into degraded
+    mode and keep counting against the in-flight limit.
+    """
+    llm_start = time.time()
+    try:
+        return llama_service.generate_response(
+            user_query=question,
+            context=context_texts
+        )
+    finally:
+        admission_controller.record_latency(time.time() - llm_start)
+        admission_controller.release()
 
 @app.get("/documents")
 async def list_documents():
@@ -164,7 +310,16 @@ async def list_documents():
         "total": len(document_store)
     }
 
+@app.get("/statistics")
+async def get_statistics():
+    """Runtime statistics: retrieval cache hit rate and admission control."""
+    cache = retrieval_service.cache
+    return {
+        "index_version": retrieval_service.vector_store.index_version,
+        "retrieval_cache": cache.stats() if cache is not None else None,
+        "admission": admission_controller.stats()
+    }
+
 # CONCEPTUAL: Additional endpoints for production
 # @app.delete("/documents/{doc_id}")
-# @app.get("/statistics")
 # @app.post("/batch_ingest")
@@ -11,6 +11,7 @@ class QueryRequest(BaseModel):
     """Schema for user query."""
     question: str = Field(..., min_length=1, max_length=1000, description="User's question")
     top_k: Optional[int] = Field(3, ge=1, le=10, description="Number of results to retrieve")
+    deadline_ms: Optional[int] = Field(None, ge=100, le=60000, description="Time budget for the answer in milliseconds")
 
 class QueryResponse(BaseModel):
     """Schema for query response."""
@@ -18,11 +19,14 @@ class QueryResponse(BaseModel):
     sources: List[str] = Field(..., description="Source documents used")
     confidence: float = Field(..., ge=0.0, le=1.0, description="Confidence score")
     processing_time: float = Field(..., description="Time taken in seconds")
+    degraded: bool = Field(False, description="Whether the answer was built without the LLM due to load")
+    degraded_reason: Optional[str] = Field(None, description="Why the answer was degraded ('overloaded' or 'deadline')")
 
 class IngestionResponse(BaseModel):
     """Schema for ingestion response."""
     document_id: str = Field(..., description="Unique document identifier")
     chunks_created: int = Field(..., description="Number of text chunks created")
+    duplicates_skipped: int = Field(0, description="Near-duplicate chunks not embedded or stored")
     status: str = Field(..., description="Ingestion status")
 
 class HealthResponse(BaseModel):
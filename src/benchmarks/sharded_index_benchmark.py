@@ -0,0 +1,77 @@
+# RUNNABLE CODE: QPS scaling benchmark for the sharded vector index
+# Usage: python -m src.benchmarks.sharded_index_benchmark --vectors 200000
+import argparse
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+
+from src.vector_store.sharded_index import ShardedVectorIndex
+
+
+def build_index(shard_dir: str, num_shards: int, vectors: np.ndarray, batch_size: int) -> ShardedVectorIndex:
+    """Create an index and load the synthetic vectors in batches."""
+    index = ShardedVectorIndex(shard_dir, num_shards=num_shards, dimension=vectors.shape[1])
+    for start in range(0, vectors.shape[0], batch_size):
+        batch = [
+            {"id": f"vec_{i}", "values": vectors[i], "metadata": {"chunk_index": i}}
+            for i in range(start, min(start + batch_size, vectors.shape[0]))
+        ]
+        index.upsert_vectors(batch)
+    return index
+
+
+def measure_qps(index: ShardedVectorIndex, queries: np.ndarray, top_k: int, clients: int) -> float:
+    """Run all queries from concurrent clients and return queries per second."""
+    # Warm up so every worker has the segments mapped
+    for query in queries[:clients]:
+        index.query_vectors(query, top_k=top_k)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as pool:
+        list(pool.map(lambda q: index.query_vectors(q, top_k=top_k), queries))
+    return len(queries) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sharded index QPS vs. core count")
+    parser.add_argument("--vectors", type=int, default=100000)
+    parser.add_argument("--dimension", type=int, default=384)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--top-k", type=int, default=3)
+    parser.add_argument("--clients", type=int, default=4)
+    parser.add_argument("--batch-size", type=int, default=10000)
+    parser.add_argument("--max-shards", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    vectors = rng.standard_normal((args.vectors, args.dimension), dtype=np.float32)
+    queries = rng.standard_normal((args.queries, args.dimension), dtype=np.float32)
+
+    shard_counts = [1]
+    while shard_counts[-1] * 2 <= args.max_shards:
+        shard_counts.append(shard_counts[-1] * 2)
+    if shard_counts[-1] != args.max_shards:
+        shard_counts.append(args.max_shards)
+
+    print(f"{args.vectors} vectors x {args.dimension} dims, {args.queries} queries, "
+          f"top_k={args.top_k}, {args.clients} clients")
+    print(f"{'shards':>6} {'QPS':>10} {'speedup':>8}")
+
+    baseline = None
+    for num_shards in shard_counts:
+        shard_dir = tempfile.mkdtemp(prefix="sharded_bench_")
+        try:
+            with build_index(shard_dir, num_shards, vectors, args.batch_size) as index:
+                qps = measure_qps(index, queries, args.top_k, args.clients)
+        finally:
+            shutil.rmtree(shard_dir, ignore_errors=True)
+
+        baseline = baseline or qps
+        print(f"{num_shards:>6} {qps:>10.1f} {qps / baseline:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
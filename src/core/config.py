@@ -22,9 +22,35 @@ class Config:
     CHUNK_SIZE: int = 1000
     CHUNK_OVERLAP: int = 200
     
+    # PDF Extraction (0 workers = one per CPU core)
+    PDF_CACHE_DIR: str = "./pdf_cache"
+    PDF_EXTRACTION_WORKERS: int = 0
+    PDF_PAGES_PER_TASK: int = 16
+    
+    # Near-Duplicate Detection (MinHash + LSH)
+    DEDUP_ENABLED: bool = True
+    DEDUP_THRESHOLD: float = 0.85
+    DEDUP_NUM_PERM: int = 128
+    DEDUP_BANDS: int = 16
+    
     # Retrieval Settings
     TOP_K_RESULTS: int = 3
     
+    # Retrieval Cache
+    RETRIEVAL_CACHE_ENABLED: bool = True
+    RETRIEVAL_CACHE_SIZE: int = 1024
+    RETRIEVAL_CACHE_TTL: float = 300.0
+    
+    # Load Shedding
+    QUERY_DEADLINE_SECONDS: float = 10.0
+    MAX_IN_FLIGHT_QUERIES: int = 64
+    DEGRADE_IN_FLIGHT_QUERIES: int = 32
+    DEGRADED_TOP_K: int = 2
+    
+    # Sharded Vector Store (0 = use Pinecone)
+    VECTOR_STORE_SHARDS: int = 0
+    VECTOR_STORE_SHARD_DIR: str = "./shard_data"
+    
     @classmethod
     def validate_config(cls):
         """Validate all required configurations are set."""
@@ -1,6 +1,7 @@
 # CONCEPTUAL: Llama-3 API integration pattern
 from typing import List, Dict, Any
 import json
+import re
 
 class LlamaService:
     """Handles communication with the Llama-3 API."""
@@ -62,6 +63,37 @@ class LlamaService:
             print(f"Error calling Llama-3 API: {e}")
             return "I apologize, but I'm having trouble generating a response right now. Please try again later or contact our support team directly."
     
+    def generate_extractive_response(self,
+                                     user_query: str,
+                                     context: List[str],
+                                     max_sentences: int = 3) -> str:
+        """Build an answer from the retrieved chunks without calling the LLM.
+        
+        Used in degraded mode: picks the context sentences that share the most
+        words with the question and returns them in document order.
+        """
+        if not context:
+            return """I'm sorry, our assistant is very busy right now and I couldn't find a quick answer. Please try again in a moment or contact our support team at support@company.com."""
+        
+        query_terms = set(re.findall(r"\w+", user_query.lower()))
+        
+        # (overlap, -position, sentence) so ties favour higher-ranked chunks
+        candidates = []
+        position = 0
+        for text in context:
+            for sentence in re.split(r'(?<=[.!?])\s+', text.strip()):
+                if sentence:
+                    overlap = len(query_terms & set(re.findall(r"\w+", sentence.lower())))
+                    candidates.append((overlap, -position, sentence))
+                    position += 1
+        
+        # Prefer sentences that mention the question at all
+        relevant = [candidate for candidate in candidates if candidate[0] > 0] or candidates
+        best = sorted(relevant, reverse=True)[:max_sentences]
+        best.sort(key=lambda candidate: -candidate[1])
+        
+        return "Here is what I found in our documentation: " + " ".join(sentence for _, _, sentence in best)
+    
     def _generate_mock_response(self, user_query: str, context: List[str]) -> str:
         """Generate realistic mock responses for GitHub demo."""
         
@@ -0,0 +1,107 @@
+# RUNNABLE CODE: Admission control and load shedding for queries
+from typing import Dict, Any, Optional
+from collections import deque
+import threading
+import time
+
+
+class AdmissionController:
+    """Decides whether a query is admitted, and whether it must degrade.
+
+    Queries beyond ``max_in_flight`` are rejected outright. Admitted queries
+    are told to degrade (smaller top_k, extractive answer instead of the LLM)
+    when more than ``degrade_in_flight`` queries are already running, or when
+    the recent LLM latency at ``latency_percentile`` would overrun the time
+    left before the request's deadline.
+
+    Latency samples expire after ``latency_max_age`` seconds, and while
+    queries are degraded for their deadline one probe query every
+    ``probe_interval`` seconds still goes to the LLM, so fresh samples keep
+    arriving and the controller recovers once the backend speeds up.
+    """
+
+    def __init__(self,
+                 max_in_flight: int = 64,
+                 degrade_in_flight: int = 32,
+                 latency_window: int = 200,
+                 latency_percentile: float = 0.9,
+                 latency_max_age: float = 30.0,
+                 probe_interval: float = 1.0):
+        self.max_in_flight = max_in_flight
+        self.degrade_in_flight = degrade_in_flight
+        self.latency_percentile = latency_percentile
+        self.latency_max_age = latency_max_age
+        self.probe_interval = probe_interval
+        self._latencies = deque(maxlen=latency_window)
+        self._last_probe = float("-inf")
+        self._lock = threading.Lock()
+
+        self.in_flight = 0
+        self.admitted = 0
+        self.rejected = 0
+        self.degraded = 0
+
+    def try_acquire(self) -> bool:
+        """Reserve a slot for a query; False means shed it."""
+        with self._lock:
+            if self.in_flight >= self.max_in_flight:
+                self.rejected += 1
+                return False
+            self.in_flight += 1
+            self.admitted += 1
+            return True
+
+    def release(self):
+        """Free a slot reserved by try_acquire."""
+        with self._lock:
+            self.in_flight -= 1
+
+    def record_latency(self, seconds: float):
+        """Record how long an LLM call took (including ones we gave up on)."""
+        with self._lock:
+            self._latencies.append((time.monotonic(), seconds))
+
+    def expected_latency(self) -> float:
+        """High-percentile LLM latency over the recent window."""
+        cutoff = time.monotonic() - self.latency_max_age
+        with self._lock:
+            while self._latencies and self._latencies[0][0] < cutoff:
+                self._latencies.popleft()
+            if not self._latencies:
+                return 0.0
+            ordered = sorted(latency for _, latency in self._latencies)
+        index = min(len(ordered) - 1, int(len(ordered) * self.latency_percentile))
+        return ordered[index]
+
+    def degrade_reason(self, remaining_seconds: float) -> Optional[str]:
+        """Return why a query should degrade, or None to answer normally."""
+        reason = None
+        if self.in_flight > self.degrade_in_flight:
+            reason = "overloaded"
+        elif self.expected_latency() > remaining_seconds:
+            reason = "deadline"
+            # Let a probe through now and then to re-measure the backend
+            with self._lock:
+                now = time.monotonic()
+                if now - self._last_probe >= self.probe_interval:
+                    self._last_probe = now
+                    reason = None
+
+        if reason is not None:
+            self.mark_degraded()
+        return reason
+
+    def mark_degraded(self):
+        """Count a query that was answered in degraded mode."""
+        with self._lock:
+            self.degraded += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Admission counters and current latency estimate."""
+        return {
+            "in_flight": self.in_flight,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "degraded": self.degraded,
+            "expected_llm_latency": self.expected_latency()
+        }
@@ -1,5 +1,5 @@
 # RUNNABLE CODE: Text chunking implementation
-from typing import List
+from typing import List, Iterable, Iterator, Optional, Tuple
 import re
 
 class TextChunker:
@@ -15,35 +15,89 @@ class TextChunker:
             return []
         
         # Split by paragraphs first
-        paragraphs = self._split_by_paragraphs(text)
+        paragraphs = ((paragraph, None) for paragraph in self._split_by_paragraphs(text))
+        return [chunk for chunk, _ in self._pack_paragraphs(paragraphs)]
+    
+    def chunk_pages(self, pages: Iterable[Tuple[Optional[int], str]]) -> Iterator[Tuple[str, List[int]]]:
+        """Split a stream of (page_number, text) pairs into overlapping chunks.
         
-        chunks = []
+        Chunks are yielded as soon as they are complete, together with the
+        page numbers they span (empty for documents without pages).
+        """
+        paragraphs = (
+            (paragraph, page)
+            for page, text in pages
+            for paragraph in self._split_by_paragraphs(text)
+        )
+        for chunk, chunk_pages in self._pack_paragraphs(paragraphs):
+            yield chunk, [page for page in chunk_pages if page is not None]
+    
+    def _pack_paragraphs(self, paragraphs: Iterable[Tuple[str, Optional[int]]]) -> Iterator[Tuple[str, List[Optional[int]]]]:
+        """Pack paragraphs into chunks, tracking the pages each chunk spans."""
         current_chunk = ""
+        # (offset in current_chunk, page) wherever a new page starts
+        spans = []
+        overlap_end = 0
         
-        for paragraph in paragraphs:
+        for paragraph, page in paragraphs:
             # If adding this paragraph would exceed chunk size
             if len(current_chunk) + len(paragraph) > self.chunk_size:
                 if current_chunk:
-                    chunks.append(current_chunk.strip())
+                    yield from self._finalize_chunk(current_chunk, spans, overlap_end)
                 
-                # Start new chunk with overlap
-                current_chunk = self._get_overlap(current_chunk) + paragraph + " "
+                # Start new chunk with overlap (taken from the previous page)
+                overlap = self._get_overlap(current_chunk)
+                if overlap.strip():
+                    spans = [(0, spans[-1][1])]
+                    overlap_end = len(overlap)
+                else:
+                    spans = []
+                    overlap_end = 0
+                start = len(overlap)
+                current_chunk = overlap + paragraph + " "
             else:
+                start = len(current_chunk)
                 current_chunk += paragraph + " "
+            
+            if not spans or spans[-1][1] != page:
+                spans.append((start, page))
         
         # Add the last chunk
         if current_chunk:
-            chunks.append(current_chunk.strip())
+            yield from self._finalize_chunk(current_chunk, spans, overlap_end)
+    
+    def _finalize_chunk(self,
+                        chunk: str,
+                        spans: List[Tuple[int, Optional[int]]],
+                        overlap_end: int) -> Iterator[Tuple[str, List[Optional[int]]]]:
+        """Emit a chunk, splitting by sentences if it is still too large.
         
-        # If any chunks are still too large, split by sentences
-        final_chunks = []
-        for chunk in chunks:
-            if len(chunk) > self.chunk_size * 1.5:
-                final_chunks.extend(self._split_by_sentences(chunk))
-            else:
-                final_chunks.append(chunk)
+        Oversized chunks are split page by page, so every piece reports only
+        the pages its text comes from.
+        """
+        pages = list(dict.fromkeys(page for _, page in spans))
+        if len(chunk.strip()) <= self.chunk_size * 1.5:
+            yield chunk.strip(), pages
+            return
+        
+        # (text, pages of its first piece, pages of the other pieces)
+        offsets = [start for start, _ in spans[1:]] + [len(chunk)]
+        slices = [
+            (chunk[start:end], [page], [page])
+            for (start, page), end in zip(spans, offsets)
+        ]
+        
+        # Overlap carried over from the previous page is folded into the
+        # first piece of the next page instead of standing alone
+        if overlap_end and len(slices) > 1 and spans[1][0] == overlap_end:
+            (overlap_text, overlap_pages, _), (text, _, page_pages) = slices[:2]
+            slices[:2] = [(overlap_text + text, overlap_pages + page_pages, page_pages)]
         
-        return final_chunks
+        for text, first_pages, other_pages in slices:
+            if not text.strip():
+                continue
+            for n, sentence_chunk in enumerate(self._split_by_sentences(text.strip())):
+                yield sentence_chunk, list(first_pages if n == 0 else other_pages)
     
     def _split_by_paragraphs(self, text: str) -> List[str]:
         """Split text into paragraphs."""
@@ -0,0 +1,228 @@
+# RUNNABLE CODE: Near-duplicate chunk detection with MinHash + LSH
+from typing import Any, List, Dict, Optional, Set, Tuple
+import hashlib
+import re
+import numpy as np
+
+# Mersenne prime used for the universal hash family h(x) = (a*x + b) mod p
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+
+
+class NearDuplicateDetector:
+    """Finds chunks that are near-duplicates of chunks already indexed.
+
+    Each chunk is reduced to a MinHash signature over its word shingles, and
+    the signatures are bucketed with banded LSH so lookups only compare
+    against likely matches. A candidate counts as a duplicate when the
+    estimated Jaccard similarity reaches ``threshold``.
+    """
+
+    def __init__(self,
+                 threshold: float = 0.85,
+                 num_perm: int = 128,
+                 bands: int = 16,
+                 shingle_size: int = 3,
+                 seed: int = 1):
+        if num_perm % bands != 0:
+            raise ValueError(f"num_perm ({num_perm}) must be divisible by bands ({bands})")
+
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, 1 << 32, size=num_perm, dtype=np.uint64)
+        self._b = rng.randint(0, 1 << 32, size=num_perm, dtype=np.uint64)
+
+        self._signatures: Dict[str, np.ndarray] = {}
+        self._buckets: List[Dict[bytes, Set[str]]] = [{} for _ in range(bands)]
+        self.canonical_of: Dict[str, str] = {}
+        self._duplicates_of: Dict[str, Set[str]] = {}
+        self._duplicate_chunks: Dict[str, Dict[str, Any]] = {}
+        # Inverse operations of the pending batch, newest last
+        self._journal: Optional[List[Tuple[Any, tuple]]] = None
+
+    def _shingles(self, text: str) -> Set[bytes]:
+        """Word n-grams of the normalised text."""
+        words = re.findall(r"\w+", text.lower())
+        if len(words) <= self.shingle_size:
+            return {" ".join(words).encode("utf-8")}
+        return {
+            " ".join(words[i:i + self.shingle_size]).encode("utf-8")
+            for i in range(len(words) - self.shingle_size + 1)
+        }
+
+    def signature(self, text: str) -> np.ndarray:
+        """Compute the MinHash signature of a text."""
+        hashes = np.array([
+            int.from_bytes(hashlib.blake2b(shingle, digest_size=4).digest(), "little")
+            for shingle in self._shingles(text)
+        ], dtype=np.uint64)
+
+        # One row per shingle, one column per permutation
+        permuted = (np.outer(hashes, self._a) + self._b) % _MERSENNE_PRIME & _MAX_HASH
+        return permuted.min(axis=0)
+
+    def _band_keys(self, signature: np.ndarray) -> List[bytes]:
+        return [
+            signature[band * self.rows:(band + 1) * self.rows].tobytes()
+            for band in range(self.bands)
+        ]
+
+    def similarity(self, first: np.ndarray, second: np.ndarray) -> float:
+        """Estimated Jaccard similarity of two signatures."""
+        return float(np.mean(first == second))
+
+    def find_duplicate(self, text: str, signature: np.ndarray = None) -> Optional[str]:
+        """Return the id of the most similar indexed chunk above the threshold.
+
+        Ties go to the smallest id, so the result doesn't depend on set order.
+        """
+        if signature is None:
+            signature = self.signature(text)
+
+        candidates: Set[str] = set()
+        for band, key in enumerate(self._band_keys(signature)):
+            candidates.update(self._buckets[band].get(key, ()))
+
+        best_id, best_score = None, -1.0
+        for candidate in sorted(candidates):
+            score = self.similarity(signature, self._signatures[candidate])
+            if score >= self.threshold and score > best_score:
+                best_id, best_score = candidate, score
+        return best_id
+
+    def add(self, chunk_id: str, text: str, signature: np.ndarray = None):
+        """Register a chunk as canonical, replacing any earlier version of it."""
+        if signature is None:
+            signature = self.signature(text)
+
+        self.remove(chunk_id)
+        self._signatures[chunk_id] = signature
+        for band, key in enumerate(self._band_keys(signature)):
+            self._buckets[band].setdefault(key, set()).add(chunk_id)
+        self._record(self.remove, chunk_id)
+
+    def remove(self, chunk_id: str):
+        """Forget a canonical chunk."""
+        signature = self._signatures.pop(chunk_id, None)
+        if signature is None:
+            return
+        for band, key in enumerate(self._band_keys(signature)):
+            bucket = self._buckets[band].get(key)
+            if bucket is not None:
+                bucket.discard(chunk_id)
+                if not bucket:
+                    del self._buckets[band][key]
+        self._record(self.add, chunk_id, None, signature)
+
+    def _link(self, chunk: Dict[str, Any], canonical: str):
+        """Record a chunk as a duplicate of a canonical chunk."""
+        self.canonical_of[chunk["id"]] = canonical
+        self._duplicates_of.setdefault(canonical, set()).add(chunk["id"])
+        self._duplicate_chunks[chunk["id"]] = chunk
+        self._record(self._unlink, chunk["id"])
+
+    def _unlink(self, chunk_id: str) -> Optional[Dict[str, Any]]:
+        """Forget that a chunk was a duplicate; returns its stored record."""
+        canonical = self.canonical_of.pop(chunk_id, None)
+        chunk = self._duplicate_chunks.pop(chunk_id, None)
+        if canonical is not None:
+            duplicates = self._duplicates_of.get(canonical, set())
+            duplicates.discard(chunk_id)
+            if not duplicates:
+                self._duplicates_of.pop(canonical, None)
+            self._record(self._link, chunk, canonical)
+        return chunk
+
+    def _record(self, undo, *args):
+        """Log the inverse of a state change while a batch is pending."""
+        if self._journal is not None:
+            self._journal.append((undo, args))
+
+    def _process(self,
+                 chunk: Dict[str, Any],
+                 to_store: List[Dict[str, Any]],
+                 duplicates: Dict[str, str],
+                 to_delete: List[str],
+                 orphans: Dict[str, Dict[str, Any]]):
+        """Classify one chunk, updating the detector state."""
+        chunk_id = chunk["id"]
+        was_canonical = chunk_id in self._signatures
+
+        # Drop the chunk's previous state first, so it can't match itself
+        self._unlink(chunk_id)
+        self.remove(chunk_id)
+        if was_canonical:
+            # Its duplicates were linked to the old text; re-check them later
+            for orphan in sorted(self._duplicates_of.get(chunk_id, ())):
+                orphans[orphan] = self._unlink(orphan)
+
+        signature = self.signature(chunk["text"])
+        canonical = self.find_duplicate(chunk["text"], signature)
+        if canonical is not None:
+            self._link(chunk, canonical)
+            duplicates[chunk_id] = canonical
+            if was_canonical:
+                to_delete.append(chunk_id)
+        else:
+            self.add(chunk_id, chunk["text"], signature)
+            to_store.append(chunk)
+
+    def deduplicate(self, chunks: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], Dict[str, str], List[str]]:
+        """Split a batch into chunks to store and near-duplicates.
+
+        Each chunk is a dict with at least ``id`` and ``text``; other keys
+        (e.g. metadata) are kept so a duplicate can be stored later. Returns:
+
+        - the chunks to embed and store. This can include duplicates from
+          earlier batches whose canonical chunk changed and which now have
+          no indexed copy;
+        - a mapping from each duplicate id to its canonical id (including
+          re-checked duplicates from earlier batches);
+        - ids that were stored before but are now duplicates, and must be
+          deleted from the vector store.
+
+        The batch stays pending until ``commit()`` is called once the vector
+        store has been updated; ``rollback()`` undoes it if storing failed,
+        so chunks that never reached the store aren't treated as indexed.
+        """
+        if self._journal is not None:
+            raise RuntimeError("Previous deduplication batch was neither committed nor rolled back")
+        self._journal = []
+
+        to_store: List[Dict[str, Any]] = []
+        duplicates: Dict[str, str] = {}
+        to_delete: List[str] = []
+        orphans: Dict[str, Dict[str, Any]] = {}
+
+        try:
+            for chunk in chunks:
+                self._process(chunk, to_store, duplicates, to_delete, orphans)
+
+            # Re-home duplicates whose canonical chunk changed or became a duplicate
+            for orphan, chunk in sorted(orphans.items()):
+                if orphan in self.canonical_of or orphan in self._signatures:
+                    continue
+                self._process(chunk, to_store, duplicates, to_delete, orphans)
+        except Exception:
+            self.rollback()
+            raise
+
+        return to_store, duplicates, to_delete
+
+    def commit(self):
+        """Keep the changes of the pending batch."""
+        self._journal = None
+
+    def rollback(self):
+        """Undo the changes of the pending batch."""
+        journal, self._journal = self._journal, None
+        for undo, args in reversed(journal or []):
+            undo(*args)
+
+    def __len__(self) -> int:
+        return len(self._signatures)
@@ -1,16 +1,18 @@
 # RUNNABLE CODE: Document processing functionality
-from typing import List, Union, BinaryIO
+from typing import List, Union, BinaryIO, Iterator, Optional, Tuple
 import tempfile
 from pathlib import Path
+from src.data.pdf_extraction import PdfExtractor
 
 class DocumentLoader:
     """Handles loading and preprocessing of company documents."""
     
-    def __init__(self):
+    def __init__(self, pdf_extractor: PdfExtractor = None):
         self.supported_extensions = {'.pdf', '.txt', '.md'}
+        self.pdf_extractor = pdf_extractor or PdfExtractor()
     
-    def load_document(self, file_path: Union[str, Path]) -> str:
-        """Load document content from file path."""
+    def _validate_path(self, file_path: Union[str, Path]) -> Path:
+        """Check that a document exists and has a supported type."""
         path = Path(file_path)
         
         if not path.exists():
@@ -19,6 +21,12 @@ class DocumentLoader:
         if path.suffix not in self.supported_extensions:
             raise ValueError(f"Unsupported file type: {path.suffix}")
         
+        return path
+    
+    def load_document(self, file_path: Union[str, Path]) -> str:
+        """Load document content from file path."""
+        path = self._validate_path(file_path)
+        
         # Text files
         if path.suffix == '.txt':
             return self._load_text_file(path)
@@ -35,23 +43,29 @@ class DocumentLoader:
     
     def _load_pdf_file(self, path: Path) -> str:
         """Extract text from PDF files."""
+        return "\n\n".join(text for _, text in self._iter_pdf_pages(path))
+    
+    def _iter_pdf_pages(self, path: Path) -> Iterator[Tuple[int, str]]:
+        """Stream (page_number, text) pairs from a PDF."""
         try:
-            # CONCEPTUAL: In production, use PyPDF2 or similar
-            # This demonstrates the approach
             print(f"Loading PDF: {path.name}")
-            # Simulated PDF text extraction
-            return f"Extracted text from PDF: {path.name}"
-            
-            # Actual implementation would be:
-            # from pypdf import PdfReader
-            # reader = PdfReader(path)
-            # text = ""
-            # for page in reader.pages:
-            #     text += page.extract_text()
-            # return text
+            yield from self.pdf_extractor.iter_pages(path)
         except Exception as e:
             raise Exception(f"Error reading PDF {path}: {str(e)}")
     
+    def load_pages(self, file_path: Union[str, Path]) -> Iterator[Tuple[Optional[int], str]]:
+        """Stream document content as (page_number, text) pairs.
+        
+        PDFs are yielded page by page as they are extracted; text files have
+        no pages and are yielded whole with a page number of None.
+        """
+        path = self._validate_path(file_path)
+        
+        if path.suffix == '.pdf':
+            yield from self._iter_pdf_pages(path)
+        else:
+            yield None, self._load_text_file(path)
+    
     def load_from_bytes(self, file_bytes: BinaryIO, filename: str) -> str:
         """Load document from bytes (for API uploads)."""
         with tempfile.NamedTemporaryFile(suffix=Path(filename).suffix, delete=False) as tmp:
@@ -64,3 +78,14 @@ class DocumentLoader:
             Path(tmp_path).unlink()
         
         return content
+    
+    def load_pages_from_bytes(self, file_bytes: BinaryIO, filename: str) -> Iterator[Tuple[Optional[int], str]]:
+        """Stream document pages from bytes (for API uploads)."""
+        with tempfile.NamedTemporaryFile(suffix=Path(filename).suffix, delete=False) as tmp:
+            tmp.write(file_bytes.read())
+            tmp_path = tmp.name
+        
+        try:
+            yield from self.load_pages(tmp_path)
+        finally:
+            Path(tmp_path).unlink()
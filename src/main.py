@@ -17,6 +17,7 @@ if __name__ == "__main__":
     print("  - POST /query     - Ask questions")
     print("  - GET  /health    - Health check")
     print("  - GET  /documents - List ingested documents")
+    print("  - GET  /statistics - Cache and index statistics")
     print("\nTo run locally (with actual services):")
     print("  1. Set environment variables:")
     print("     - PINECONE_API_KEY")
@@ -0,0 +1,135 @@
+import pytest
+
+from src.data.deduplication import NearDuplicateDetector
+
+REFUND = ("Our company offers a 30-day money-back guarantee on all products. Refunds are "
+          "processed within 7-10 business days after we receive the returned item. To request "
+          "a refund, please contact our support team with your order number and reason for return.")
+SHIPPING = ("Standard shipping takes 3-5 business days within the continental US. International "
+            "shipping typically takes 7-14 business days. You can track your order using the "
+            "tracking link provided in your confirmation email.")
+WARRANTY = ("All products come with a 1-year manufacturer's warranty. For warranty claims, please "
+            "contact our support team with your purchase details and a description of the issue.")
+
+
+def _chunk(chunk_id, text):
+    return {"id": chunk_id, "text": text, "metadata": {"text": text}}
+
+
+def _ingest(detector, chunks):
+    result = detector.deduplicate(chunks)
+    detector.commit()
+    return result
+
+
+def _ids(chunks):
+    return [chunk["id"] for chunk in chunks]
+
+
+def test_near_duplicate_is_skipped_and_linked():
+    detector = NearDuplicateDetector()
+    to_store, duplicates, to_delete = detector.deduplicate([
+        _chunk("a_0", REFUND),
+        _chunk("a_1", SHIPPING),
+        _chunk("b_0", REFUND + " Thank you."),
+    ])
+
+    assert _ids(to_store) == ["a_0", "a_1"]
+    assert duplicates == {"b_0": "a_0"}
+    assert to_delete == []
+    assert detector.canonical_of == {"b_0": "a_0"}
+
+
+def test_reingesting_same_chunk_is_an_update():
+    detector = NearDuplicateDetector()
+    _ingest(detector, [_chunk("a_0", REFUND)])
+
+    to_store, duplicates, _ = detector.deduplicate([_chunk("a_0", REFUND)])
+    assert _ids(to_store) == ["a_0"]
+    assert duplicates == {}
+
+
+def test_own_previous_version_is_ignored_and_ties_are_deterministic():
+    detector = NearDuplicateDetector()
+    # Two canonical chunks with identical text: any lookup ties between them
+    detector.add("a_0", REFUND)
+    detector.add("b_0", REFUND)
+
+    to_store, duplicates, to_delete = detector.deduplicate([_chunk("b_0", REFUND)])
+    assert duplicates == {"b_0": "a_0"}
+    assert to_delete == ["b_0"]
+
+    # Ties resolve the same way regardless of set order
+    assert detector.find_duplicate(REFUND) == "a_0"
+
+
+def test_canonical_that_becomes_duplicate_is_retired():
+    detector = NearDuplicateDetector()
+    _ingest(detector, [_chunk("a_0", REFUND), _chunk("b_0", SHIPPING)])
+
+    to_store, duplicates, to_delete = detector.deduplicate([_chunk("a_0", SHIPPING)])
+    assert to_store == []
+    assert duplicates == {"a_0": "b_0"}
+    assert to_delete == ["a_0"]
+    # The old text no longer resolves to the retired id
+    assert detector.find_duplicate(REFUND) is None
+
+
+def test_duplicates_of_changed_canonical_are_promoted():
+    detector = NearDuplicateDetector()
+    _ingest(detector, [_chunk("a_0", REFUND)])
+    _ingest(detector, [_chunk("b_0", REFUND), _chunk("c_0", REFUND + " Thanks.")])
+    assert detector.canonical_of == {"b_0": "a_0", "c_0": "a_0"}
+
+    to_store, duplicates, _ = detector.deduplicate([_chunk("a_0", WARRANTY)])
+
+    # One former duplicate gets indexed again, the other links to it
+    assert _ids(to_store) == ["a_0", "b_0"]
+    assert to_store[1]["metadata"]["text"] == REFUND
+    assert duplicates == {"c_0": "b_0"}
+    assert detector.find_duplicate(REFUND) == "b_0"
+
+
+def test_duplicate_in_batch_relinked_when_its_canonical_changes_later_in_batch():
+    detector = NearDuplicateDetector()
+    _ingest(detector, [_chunk("a_0", REFUND)])
+
+    to_store, duplicates, _ = detector.deduplicate([
+        _chunk("b_0", REFUND),
+        _chunk("a_0", WARRANTY),
+    ])
+    assert sorted(_ids(to_store)) == ["a_0", "b_0"]
+    assert duplicates == {"b_0": "a_0"}
+    assert detector.canonical_of == {}
+
+
+def test_rollback_restores_state_before_the_batch():
+    detector = NearDuplicateDetector()
+    _ingest(detector, [_chunk("a_0", REFUND)])
+    _ingest(detector, [_chunk("b_0", REFUND)])
+
+    # The store failed: a_0 changing text and c_0 being added never happened
+    detector.deduplicate([_chunk("a_0", WARRANTY), _chunk("c_0", SHIPPING)])
+    detector.rollback()
+
+    assert detector.canonical_of == {"b_0": "a_0"}
+    assert detector.find_duplicate(REFUND) == "a_0"
+    assert detector.find_duplicate(WARRANTY) is None
+    assert detector.find_duplicate(SHIPPING) is None
+
+    # Retrying the same upload sees exactly what the first attempt saw
+    to_store, duplicates, _ = detector.deduplicate([_chunk("c_0", SHIPPING)])
+    assert _ids(to_store) == ["c_0"]
+    assert duplicates == {}
+
+
+def test_pending_batch_must_be_committed_first():
+    detector = NearDuplicateDetector()
+    detector.deduplicate([_chunk("a_0", REFUND)])
+
+    with pytest.raises(RuntimeError):
+        detector.deduplicate([_chunk("b_0", REFUND)])
+
+    detector.commit()
+    _, duplicates, _ = detector.deduplicate([_chunk("b_0", REFUND)])
+    assert duplicates == {"b_0": "a_0"}
@@ -1 +1,134 @@
+import re
 
+import pytest
+from pypdf import PdfWriter
+from pypdf.generic import DecodedStreamObject, DictionaryObject, NameObject
+
+from src.data import pdf_extraction
+from src.data.chunking import TextChunker
+from src.data.document_loader import DocumentLoader
+from src.data.pdf_extraction import PdfExtractor
+
+
+def _write_pdf(path, page_count, lines_per_page=5):
+    """Write a PDF whose page i says "Page i line j ..." on each line."""
+    writer = PdfWriter()
+    font = writer._add_object(DictionaryObject({
+        NameObject("/Type"): NameObject("/Font"),
+        NameObject("/Subtype"): NameObject("/Type1"),
+        NameObject("/BaseFont"): NameObject("/Helvetica"),
+    }))
+    for page_number in range(1, page_count + 1):
+        page = writer.add_blank_page(612, 792)
+        page[NameObject("/Resources")] = DictionaryObject({
+            NameObject("/Font"): DictionaryObject({NameObject("/F1"): font})
+        })
+        lines = " ".join(
+            f"(Page {page_number} line {line} about refunds.) '" for line in range(lines_per_page)
+        )
+        content = DecodedStreamObject()
+        content.set_data(f"BT /F1 10 Tf 50 750 Td 14 TL {lines} ET".encode())
+        page[NameObject("/Contents")] = writer._add_object(content)
+    writer.write(str(path))
+    return path
+
+
+@pytest.fixture
+def extractor(tmp_path):
+    extractor = PdfExtractor(cache_dir=str(tmp_path / "cache"), max_workers=2, pages_per_task=3)
+    yield extractor
+    extractor.close()
+
+
+def test_pdf_pages_are_streamed_in_order(tmp_path, extractor):
+    path = _write_pdf(tmp_path / "manual.pdf", page_count=10)
+
+    pages = list(extractor.iter_pages(path))
+
+    assert [number for number, _ in pages] == list(range(1, 11))
+    for number, text in pages:
+        assert f"Page {number} line 0" in text
+
+
+def test_reingesting_same_content_uses_cache(tmp_path, extractor, monkeypatch):
+    first = _write_pdf(tmp_path / "manual.pdf", page_count=4)
+    expected = list(extractor.iter_pages(first))
+
+    # Same bytes under another name must not touch pypdf again
+    copy = tmp_path / "manual_copy.pdf"
+    copy.write_bytes(first.read_bytes())
+
+    def fail(*args, **kwargs):
+        raise AssertionError("PDF was extracted again")
+
+    monkeypatch.setattr(pdf_extraction, "PdfReader", fail)
+    monkeypatch.setattr(pdf_extraction, "_extract_page_range", fail)
+    assert list(extractor.iter_pages(copy)) == expected
+
+
+def test_loader_streams_pages_and_text_files(tmp_path, extractor):
+    loader = DocumentLoader(pdf_extractor=extractor)
+    pdf_path = _write_pdf(tmp_path / "manual.pdf", page_count=2)
+    text_path = tmp_path / "policies.txt"
+    text_path.write_text("Refunds take 7-10 days.", encoding="utf-8")
+
+    assert [number for number, _ in loader.load_pages(pdf_path)] == [1, 2]
+    assert list(loader.load_pages(text_path)) == [(None, "Refunds take 7-10 days.")]
+    assert "Page 2 line 0" in loader.load_document(pdf_path)
+
+
+def test_chunks_report_the_pages_they_span():
+    chunker = TextChunker(chunk_size=60, chunk_overlap=0)
+    pages = [
+        (1, "First page paragraph one."),
+        (2, "Second page paragraph, quite a bit longer."),
+        (3, "Third page."),
+    ]
+
+    chunks = list(chunker.chunk_pages(pages))
+
+    assert chunks == [
+        ("First page paragraph one.", [1]),
+        ("Second page paragraph, quite a bit longer. Third page.", [2, 3]),
+    ]
+
+
+def test_chunk_without_pages_has_no_page_numbers():
+    chunker = TextChunker(chunk_size=100, chunk_overlap=20)
+    text = "Refunds take 7-10 days.\n\nShipping takes 3-5 days."
+
+    assert list(chunker.chunk_pages([(None, text)])) == [
+        (chunk, []) for chunk in chunker.chunk_document(text)
+    ]
+
+
+def test_sentence_split_pieces_keep_their_own_pages():
+    chunker = TextChunker(chunk_size=100, chunk_overlap=0)
+    sentences = {
+        page: " ".join(f"Page {page} sentence {n} is here." for n in range(8))
+        for page in (1, 2)
+    }
+    # One paragraph per page, each larger than the chunk size, so each has
+    # to be split by sentences
+    chunks = list(chunker.chunk_pages(sentences.items()))
+
+    assert len(chunks) > 2
+    for text, pages in chunks:
+        expected = sorted({int(page) for page in re.findall(r"Page (\d+)", text)})
+        assert pages == expected
+
+
+def test_overlap_from_previous_page_is_attributed_to_it():
+    chunker = TextChunker(chunk_size=100, chunk_overlap=40)
+    pages = [
+        (1, "Page 1 sentence 0 is here. Page 1 sentence 1 is here. Page 1 sentence 2 is here"),
+        (2, " ".join(f"Page 2 sentence {n} is here." for n in range(8))),
+    ]
+
+    chunks = list(chunker.chunk_pages(pages))
+
+    assert chunks[0][1] == [1]
+    # The first page-2 piece starts with overlap text from page 1
+    assert chunks[1][0].startswith("Page 1 sentence 2")
+    assert chunks[1][1] == [1, 2]
+    assert all(pages == [2] for _, pages in chunks[2:])
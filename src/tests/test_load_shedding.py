@@ -0,0 +1,72 @@
+import pytest
+
+from src.core import load_shedding
+from src.core.load_shedding import AdmissionController
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(load_shedding.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_rejects_beyond_max_in_flight():
+    controller = AdmissionController(max_in_flight=2)
+    assert controller.try_acquire()
+    assert controller.try_acquire()
+    assert not controller.try_acquire()
+
+    controller.release()
+    assert controller.try_acquire()
+    assert controller.stats()["rejected"] == 1
+
+
+def test_degrades_when_overloaded():
+    controller = AdmissionController(max_in_flight=4, degrade_in_flight=1)
+    controller.try_acquire()
+    assert controller.degrade_reason(10.0) is None
+
+    controller.try_acquire()
+    assert controller.degrade_reason(10.0) == "overloaded"
+
+
+def test_expected_latency_is_high_percentile(clock):
+    controller = AdmissionController(latency_percentile=0.9)
+    for latency in [0.1] * 9 + [5.0]:
+        controller.record_latency(latency)
+    assert controller.expected_latency() == 5.0
+
+
+def test_degrades_for_deadline_but_lets_probes_through(clock):
+    controller = AdmissionController(probe_interval=1.0)
+    for _ in range(5):
+        controller.record_latency(12.0)
+
+    # The first query after the slowdown is a probe; the rest degrade
+    assert controller.degrade_reason(2.0) is None
+    assert controller.degrade_reason(2.0) == "deadline"
+    assert controller.degrade_reason(2.0) == "deadline"
+
+    clock[0] += 1.0
+    assert controller.degrade_reason(2.0) is None
+    assert controller.degrade_reason(2.0) == "deadline"
+
+    # A fast probe alone doesn't outweigh the slow window, but the
+    # controller recovers once the old samples age out
+    controller.record_latency(0.2)
+    assert controller.expected_latency() == 12.0
+    clock[0] += controller.latency_max_age
+    controller.record_latency(0.2)
+    assert controller.expected_latency() == 0.2
+    assert controller.degrade_reason(2.0) is None
+
+
+def test_old_samples_expire(clock):
+    controller = AdmissionController(latency_max_age=30.0)
+    controller.record_latency(12.0)
+    assert controller.expected_latency() == 12.0
+
+    clock[0] += 31.0
+    assert controller.expected_latency() == 0.0
+    assert controller.degrade_reason(2.0) is None
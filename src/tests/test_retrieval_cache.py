@@ -0,0 +1,80 @@
+import numpy as np
+
+from src.vector_store import retrieval_cache
+from src.vector_store.retrieval_cache import RetrievalCache, normalize_query
+from src.vector_store.sharded_index import ShardedVectorIndex
+
+
+def test_trivially_different_queries_normalize_equal():
+    assert normalize_query("Refund policy?") == "refund policy"
+    assert normalize_query("  REFUND   policy ") == "refund policy"
+    assert normalize_query("Refund policy?") != normalize_query("Shipping policy?")
+
+
+def test_key_includes_top_k_filters_and_index_version():
+    key = RetrievalCache.make_key("Refund policy?", 3, None, 1)
+
+    assert key == RetrievalCache.make_key("refund policy", 3, None, 1)
+    assert key != RetrievalCache.make_key("refund policy", 5, None, 1)
+    assert key != RetrievalCache.make_key("refund policy", 3, {"source": "faq.pdf"}, 1)
+    assert key != RetrievalCache.make_key("refund policy", 3, None, 2)
+    assert (RetrievalCache.make_key("q", 3, {"a": 1, "b": 2}, 1)
+            == RetrievalCache.make_key("q", 3, {"b": 2, "a": 1}, 1))
+
+
+def test_index_version_bump_invalidates(tmp_path):
+    cache = RetrievalCache()
+    with ShardedVectorIndex(str(tmp_path), num_shards=1, dimension=4) as index:
+        key = RetrievalCache.make_key("refund policy", 3, None, index.index_version)
+        cache.put(key, [{"text": "old", "source": "a.txt", "score": 0.9}])
+
+        index.upsert_vectors([{"id": "v0", "values": [1.0, 0.0, 0.0, 0.0], "metadata": {}}])
+        assert cache.get(RetrievalCache.make_key("refund policy", 3, None, index.index_version)) is None
+
+        version = index.index_version
+        index.delete_vectors(["v0"])
+        assert index.index_version > version
+
+
+def test_lru_eviction_and_hit_rate():
+    cache = RetrievalCache(max_entries=2)
+    cache.put("a", [])
+    cache.put("b", [])
+    assert cache.get("a") == []
+    cache.put("c", [])
+
+    assert cache.get("b") is None
+    stats = cache.stats()
+    assert stats["entries"] == 2
+    assert stats["evictions"] == 1
+    assert stats["hits"] == 1 and stats["misses"] == 1
+    assert stats["hit_rate"] == 0.5
+
+
+def test_ttl_expiry(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(retrieval_cache.time, "monotonic", lambda: now[0])
+    cache = RetrievalCache(ttl_seconds=10)
+    cache.put("a", [{"text": "x"}])
+
+    now[0] += 5
+    assert cache.get("a") == [{"text": "x"}]
+    now[0] += 6
+    assert cache.get("a") is None
+    assert cache.stats()["expirations"] == 1
+
+
+def test_cached_results_are_copies():
+    cache = RetrievalCache()
+    cache.put("a", [{"text": "x"}])
+    cache.get("a")[0]["text"] = "mutated"
+    assert cache.get("a") == [{"text": "x"}]
+
+
+def test_failed_query_is_reported_as_none(tmp_path):
+    index = ShardedVectorIndex(str(tmp_path), num_shards=1, dimension=4)
+    index.upsert_vectors([{"id": "v0", "values": [1.0, 0.0, 0.0, 0.0], "metadata": {}}])
+    assert index.query_vectors(np.ones(4).tolist(), top_k=1) != []
+
+    index.close()
+    assert index.query_vectors(np.ones(4).tolist(), top_k=1) is None
@@ -0,0 +1,119 @@
+import numpy as np
+import pytest
+
+from src.vector_store import sharded_index
+from src.vector_store.sharded_index import ShardedVectorIndex
+
+DIMENSION = 16
+
+
+@pytest.fixture
+def vectors():
+    rng = np.random.default_rng(0)
+    return rng.standard_normal((200, DIMENSION)).astype(np.float32)
+
+
+@pytest.fixture
+def index(tmp_path):
+    with ShardedVectorIndex(str(tmp_path), num_shards=3, dimension=DIMENSION) as index:
+        yield index
+
+
+def _records(vectors, ids=None, **metadata):
+    ids = ids if ids is not None else range(len(vectors))
+    return [
+        {"id": f"v{i}", "values": vectors[n].tolist(), "metadata": {"n": int(i), **metadata}}
+        for n, i in enumerate(ids)
+    ]
+
+
+def _brute_force(vectors, query, top_k):
+    normalized = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    scores = normalized @ (query / np.linalg.norm(query))
+    return [f"v{i}" for i in np.argsort(-scores)[:top_k]]
+
+
+def test_merged_top_k_matches_brute_force(index, vectors):
+    index.upsert_vectors(_records(vectors))
+
+    for query in vectors[:5]:
+        results = index.query_vectors(query.tolist(), top_k=5)
+        assert [r["id"] for r in results] == _brute_force(vectors, query, 5)
+
+
+def test_ids_are_routed_to_a_stable_shard(index, vectors):
+    index.upsert_vectors(_records(vectors))
+
+    for i in range(20):
+        shard = index.shard_for_id(f"v{i}")
+        assert shard == index.shard_for_id(f"v{i}")
+        assert any(f"shard_{shard:03d}" in path for path in index._segments["default"][shard])
+
+
+def test_update_supersedes_older_version(index, vectors):
+    index.upsert_vectors(_records(vectors))
+    index.upsert_vectors([{"id": "v0", "values": (-vectors[0]).tolist(), "metadata": {"n": "new"}}])
+
+    results = index.query_vectors(vectors[0].tolist(), top_k=200)
+    assert "v0" not in [r["id"] for r in results[:10]]
+    assert [r["id"] for r in results].count("v0") == 1
+
+
+def test_delete_writes_tombstone(index, vectors):
+    index.upsert_vectors(_records(vectors))
+    version = index.index_version
+
+    assert index.delete_vectors(["v3"])
+    assert index.index_version > version
+    results = index.query_vectors(vectors[3].tolist(), top_k=200)
+    assert "v3" not in [r["id"] for r in results]
+
+
+def test_filter_matches_metadata(index, vectors):
+    index.upsert_vectors(_records(vectors[:100], ids=range(100), source="a.txt"))
+    index.upsert_vectors(_records(vectors[100:], ids=range(100, 200), source="b.txt"))
+
+    results = index.query_vectors(vectors[0].tolist(), top_k=10, filter={"source": "b.txt"})
+    assert len(results) == 10
+    assert all(r["metadata"]["source"] == "b.txt" for r in results)
+
+
+def test_compaction_bounds_segments_and_keeps_results(tmp_path, vectors):
+    with ShardedVectorIndex(str(tmp_path), num_shards=2, dimension=DIMENSION,
+                            max_segments_per_shard=3) as index:
+        for start in range(0, 200, 20):
+            index.upsert_vectors(_records(vectors[start:start + 20], ids=range(start, start + 20)))
+        index.delete_vectors(["v7"])
+
+        assert index.segment_count() <= 2 * 3
+        index.compact()
+        assert index.segment_count() == 2
+
+        results = index.query_vectors(vectors[7].tolist(), top_k=200)
+        ids = [r["id"] for r in results]
+        assert "v7" not in ids
+        assert len(ids) == len(set(ids)) == 199
+
+    # Reopening picks up the compacted segments and keeps sequence numbers increasing
+    with ShardedVectorIndex(str(tmp_path), num_shards=2, dimension=DIMENSION) as reopened:
+        reopened.upsert_vectors([{"id": "v8", "values": (-vectors[8]).tolist(), "metadata": {}}])
+        results = reopened.query_vectors(vectors[8].tolist(), top_k=5)
+        assert "v8" not in [r["id"] for r in results]
+
+
+def test_live_mask_cache_keeps_only_latest_snapshot(tmp_path, vectors):
+    sharded_index._LIVE_MASK_CACHE.clear()
+    sharded_index._SEGMENT_CACHE.clear()
+    with ShardedVectorIndex(str(tmp_path), num_shards=1, dimension=DIMENSION,
+                            max_segments_per_shard=100) as index:
+        for start in range(0, 100, 10):
+            index.upsert_vectors(_records(vectors[start:start + 10], ids=range(start, start + 10)))
+            snapshot = tuple(index._segments["default"][0])
+            sharded_index._live_masks(snapshot)
+
+        assert len(sharded_index._LIVE_MASK_CACHE) == 1
+
+        index.compact()
+        compacted = tuple(index._segments["default"][0])
+        sharded_index._live_masks(compacted)
+        assert set(sharded_index._SEGMENT_CACHE) == set(compacted)
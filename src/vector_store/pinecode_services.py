@@ -1,6 +1,6 @@
 # CONCEPTUAL: Pinecone integration pattern
 # This shows the complete production code structure
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import pinecone
 
 class PineconeService:
@@ -11,6 +11,7 @@ class PineconeService:
         self.environment = environment
         self.index_name = index_name
         self.index = None
+        self.index_version = 0
         
         # Initialize connection
         self._initialize_pinecone()
@@ -62,24 +63,48 @@ class PineconeService:
             for vector in vectors[:3]:  # Show first 3 for demo
                 print(f"  - ID: {vector.get('id', 'N/A')}")
             
+            self.index_version += 1
             return True
         except Exception as e:
             print(f"Error upserting vectors: {e}")
             return False
     
+    def delete_vectors(self, ids: List[str], namespace: str = "default"):
+        """Delete vectors from the index by id."""
+        if not ids:
+            return False
+        
+        try:
+            # CONCEPTUAL: Actual delete operation
+            # self.index.delete(ids=ids, namespace=namespace)
+            
+            print(f"Deleting {len(ids)} vectors from namespace '{namespace}'")
+            
+            self.index_version += 1
+            return True
+        except Exception as e:
+            print(f"Error deleting vectors: {e}")
+            return False
+    
     def query_vectors(self, 
                      query_embedding: List[float], 
                      top_k: int = 3,
                      namespace: str = "default",
-                     include_metadata: bool = True) -> List[Dict[str, Any]]:
-        """Query similar vectors from the index."""
+                     include_metadata: bool = True,
+                     filter: Optional[Dict[str, Any]] = None) -> Optional[List[Dict[str, Any]]]:
+        """Query similar vectors from the index.
+        
+        Returns None if the query failed, so callers can tell a failure
+        apart from an empty result.
+        """
         try:
             # CONCEPTUAL: Actual query operation
             # response = self.index.query(
             #     vector=query_embedding,
             #     top_k=top_k,
             #     namespace=namespace,
-            #     include_metadata=include_metadata
+            #     include_metadata=include_metadata,
+            #     filter=filter
             # )
             
             print(f"Querying for top {top_k} matches")
@@ -119,7 +144,7 @@ class PineconeService:
             
         except Exception as e:
             print(f"Error querying vectors: {e}")
-            return []
+            return None
 
 class MockPineconeIndex:
     """Mock Pinecone index for GitHub demonstration."""
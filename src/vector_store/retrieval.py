@@ -1,7 +1,9 @@
 # RUNNABLE CODE: Retrieval logic
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from src.core.embedding_service import EmbeddingService
 from src.vector_store.pinecone_service import PineconeService
+from src.vector_store.sharded_index import ShardedVectorIndex
+from src.vector_store.retrieval_cache import RetrievalCache
 
 class RetrievalService:
     """Orchestrates the retrieval of relevant document chunks."""
@@ -9,26 +11,59 @@ class RetrievalService:
     def __init__(self, config):
         self.config = config
         self.embedding_service = EmbeddingService(config.EMBEDDING_MODEL)
-        self.pinecone_service = PineconeService(
-            api_key=config.PINECONE_API_KEY,
-            environment=config.PINECONE_ENVIRONMENT,
-            index_name=config.PINECONE_INDEX_NAME
-        )
+        
+        # Local sharded index when configured, Pinecone otherwise
+        if config.VECTOR_STORE_SHARDS > 0:
+            self.vector_store = ShardedVectorIndex(
+                shard_dir=config.VECTOR_STORE_SHARD_DIR,
+                num_shards=config.VECTOR_STORE_SHARDS,
+                dimension=self.embedding_service.get_embedding_dimension()
+            )
+        else:
+            self.vector_store = PineconeService(
+                api_key=config.PINECONE_API_KEY,
+                environment=config.PINECONE_ENVIRONMENT,
+                index_name=config.PINECONE_INDEX_NAME
+            )
+        
+        self.cache = None
+        if config.RETRIEVAL_CACHE_ENABLED:
+            self.cache = RetrievalCache(
+                max_entries=config.RETRIEVAL_CACHE_SIZE,
+                ttl_seconds=config.RETRIEVAL_CACHE_TTL
+            )
     
-    def retrieve_relevant_context(self, query: str, top_k: int = None) -> List[Dict[str, Any]]:
+    def retrieve_relevant_context(self,
+                                  query: str,
+                                  top_k: int = None,
+                                  filters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
         """Retrieve relevant document chunks for a query."""
         if top_k is None:
             top_k = self.config.TOP_K_RESULTS
         
+        # Serve repeated questions from the cache; the index version in the
+        # key makes any upsert or delete invalidate earlier results
+        cache_key = None
+        if self.cache is not None:
+            cache_key = RetrievalCache.make_key(query, top_k, filters, self.vector_store.index_version)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return cached
+        
         # Generate query embedding
         query_embedding = self.embedding_service.generate_embeddings([query])[0]
         
-        # Query Pinecone for similar vectors
-        results = self.pinecone_service.query_vectors(
+        # Query the vector store for similar vectors
+        results = self.vector_store.query_vectors(
             query_embedding=query_embedding,
-            top_k=top_k
+            top_k=top_k,
+            filter=filters
         )
         
+        # Don't cache failures: an error shouldn't pin empty context in the cache
+        if results is None:
+            return []
+        
         # Extract context from results
         context_chunks = []
         for result in results:
@@ -39,4 +74,7 @@ class RetrievalService:
                     'score': result.get('score', 0.0)
                 })
         
+        if self.cache is not None:
+            self.cache.put(cache_key, context_chunks)
+        
         return context_chunks
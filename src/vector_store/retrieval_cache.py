@@ -0,0 +1,95 @@
+# RUNNABLE CODE: Retrieval result cache
+from typing import List, Dict, Any, Optional, Tuple, Hashable
+from collections import OrderedDict
+import json
+import re
+import threading
+import time
+import unicodedata
+
+
+def normalize_query(query: str) -> str:
+    """Normalise a query so trivially different phrasings share a cache entry.
+
+    "Refund policy?", "refund  policy" and "REFUND POLICY" all become
+    "refund policy".
+    """
+    text = unicodedata.normalize("NFKC", query).casefold()
+    text = re.sub(r"[^\w\s]", " ", text)
+    return " ".join(text.split())
+
+
+class RetrievalCache:
+    """Bounded LRU cache with TTL expiry for retrieval results.
+
+    Keys include the vector store's index version, so entries written
+    before an upsert or delete can never be returned afterwards; they simply
+    age out of the LRU.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 300.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, Tuple[float, List[Dict[str, Any]]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @staticmethod
+    def make_key(query: str,
+                 top_k: int,
+                 filters: Optional[Dict[str, Any]],
+                 index_version: int) -> Hashable:
+        """Build the cache key for a retrieval request."""
+        filters_key = json.dumps(filters, sort_keys=True, default=str) if filters else ""
+        return (normalize_query(query), top_k, filters_key, index_version)
+
+    def get(self, key: Hashable) -> Optional[List[Dict[str, Any]]]:
+        """Return a cached result, or None on a miss or expired entry."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            stored_at, results = entry
+            if time.monotonic() - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return [dict(result) for result in results]
+
+    def put(self, key: Hashable, results: List[Dict[str, Any]]):
+        """Store a result, evicting the least recently used entries if full."""
+        with self._lock:
+            self._entries[key] = (time.monotonic(), [dict(result) for result in results])
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """Drop all cached entries (statistics are kept)."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Cache size and hit-rate metrics."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_rate": self.hits / lookups if lookups else 0.0
+            }
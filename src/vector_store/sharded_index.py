@@ -0,0 +1,370 @@
+# RUNNABLE CODE: Multi-core sharded vector index
+# Local alternative to Pinecone that spreads vectors over N shards and
+# answers each query by scatter-gather across a pool of worker processes.
+from typing import List, Dict, Any, Optional, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+import heapq
+import json
+import os
+import threading
+import zlib
+import numpy as np
+
+# Per-process cache of opened segments: path -> (matrix, ids, metadata, deleted).
+# Matrices are np.memmap views, so every worker shares the same page cache
+# instead of holding its own copy of the vectors.
+_SEGMENT_CACHE: Dict[str, Tuple[np.ndarray, List[str], List[Dict[str, Any]], List[str]]] = {}
+
+# Per-process cache of live-row masks: shard directory -> (segment list, masks).
+# Only the latest snapshot of each shard is kept.
+_LIVE_MASK_CACHE: Dict[str, Tuple[Tuple[str, ...], List[np.ndarray]]] = {}
+
+
+def _open_segment(path: str) -> Tuple[np.ndarray, List[str], List[Dict[str, Any]], List[str]]:
+    """Memory-map a segment and load its ids/metadata (cached per process)."""
+    segment = _SEGMENT_CACHE.get(path)
+    if segment is None:
+        matrix = np.load(path, mmap_mode="r")
+        with open(path[:-len(".npy")] + ".json", "r", encoding="utf-8") as file:
+            records = json.load(file)
+        segment = (matrix, records["ids"], records["metadata"], records.get("deleted", []))
+        _SEGMENT_CACHE[path] = segment
+    return segment
+
+
+def _live_masks(segment_paths: Tuple[str, ...]) -> List[np.ndarray]:
+    """Mark rows that are not superseded or deleted by a newer segment."""
+    shard_key = os.path.dirname(segment_paths[0])
+    cached = _LIVE_MASK_CACHE.get(shard_key)
+    if cached is not None and cached[0] == segment_paths:
+        return cached[1]
+
+    # A new snapshot of this shard: forget segments that are no longer part
+    # of it (superseded by compaction) before building the new masks
+    if cached is not None:
+        for stale_path in set(cached[0]) - set(segment_paths):
+            _SEGMENT_CACHE.pop(stale_path, None)
+
+    seen = set()
+    masks = []
+    for path in reversed(segment_paths):
+        _, ids, _, deleted = _open_segment(path)
+        mask = np.array([vector_id not in seen for vector_id in ids], dtype=bool)
+        seen.update(ids)
+        seen.update(deleted)
+        masks.append(mask)
+    masks.reverse()
+    _LIVE_MASK_CACHE[shard_key] = (segment_paths, masks)
+    return masks
+
+
+def _query_shard(segment_paths: Tuple[str, ...],
+                 query: np.ndarray,
+                 top_k: int,
+                 include_metadata: bool,
+                 filter: Optional[Dict[str, Any]] = None) -> List[Tuple[float, str, Optional[Dict[str, Any]]]]:
+    """Compute the local top-k of one shard (runs inside a worker process)."""
+    candidates = []
+    for path, mask in zip(segment_paths, _live_masks(segment_paths)):
+        matrix, ids, metadata, _ = _open_segment(path)
+        if matrix.shape[0] == 0:
+            continue
+
+        # Metadata filter: exact match on every given field
+        if filter:
+            mask = mask & np.array([
+                all(entry.get(field) == value for field, value in filter.items())
+                for entry in metadata
+            ], dtype=bool)
+
+        scores = np.asarray(matrix @ query)
+        scores[~mask] = -np.inf
+
+        k = min(top_k, scores.shape[0])
+        best = np.argpartition(-scores, k - 1)[:k]
+        for row in best:
+            if mask[row]:
+                candidates.append((
+                    float(scores[row]),
+                    ids[row],
+                    metadata[row] if include_metadata else None
+                ))
+
+    return heapq.nlargest(top_k, candidates, key=lambda item: item[0])
+
+
+class ShardedVectorIndex:
+    """Partitions vectors across shards and queries them in parallel.
+
+    Each shard is a directory of immutable segments (a ``.npy`` matrix of
+    L2-normalised vectors plus a ``.json`` file with ids and metadata).
+    Vectors are routed to a shard by a stable hash of their id, so an update
+    always lands on the shard that holds the old version. Writing a batch
+    only publishes new segment files for the shards it touches; all other
+    shards, and the old segments of the written shard, keep serving queries.
+    Once a shard has more than ``max_segments_per_shard`` segments they are
+    compacted into one, dropping superseded rows and tombstones.
+    """
+
+    def __init__(self,
+                 shard_dir: str,
+                 num_shards: int = None,
+                 dimension: int = 384,
+                 max_segments_per_shard: int = 8):
+        self.shard_dir = Path(shard_dir)
+        self.num_shards = num_shards or os.cpu_count() or 1
+        self.dimension = dimension
+        self.max_segments_per_shard = max_segments_per_shard
+        self._lock = threading.Lock()
+        self._segments: Dict[str, List[List[str]]] = {}
+        self._next_segment: Dict[Tuple[str, int], int] = {}
+        self._compacting = set()
+        self.index_version = 0
+        self._executor = ProcessPoolExecutor(max_workers=self.num_shards)
+
+        print(f"Initializing sharded index at {self.shard_dir} with {self.num_shards} shards")
+
+    def _shard_path(self, namespace: str, shard: int) -> Path:
+        return self.shard_dir / namespace / f"shard_{shard:03d}"
+
+    def _load_namespace(self, namespace: str) -> List[List[str]]:
+        """Discover the published segments of a namespace on disk."""
+        segments = self._segments.get(namespace)
+        if segments is None:
+            segments = []
+            for shard in range(self.num_shards):
+                paths = sorted(str(p) for p in self._shard_path(namespace, shard).glob("seg_*.npy"))
+                segments.append(paths)
+                # Names are seg_<sequence>[c...].npy; compacted segments add a "c"
+                self._next_segment[(namespace, shard)] = max(
+                    (int(Path(path).name[4:12]) + 1 for path in paths), default=0
+                )
+            self._segments[namespace] = segments
+        return segments
+
+    def shard_for_id(self, vector_id: str) -> int:
+        """Return the shard a vector id is routed to."""
+        return zlib.crc32(vector_id.encode("utf-8")) % self.num_shards
+
+    def _write_segment(self,
+                       namespace: str,
+                       shard: int,
+                       ids: List[str],
+                       metadata: List[Dict[str, Any]],
+                       matrix: np.ndarray,
+                       deleted: List[str] = None,
+                       name: str = None) -> str:
+        """Write one immutable segment (vectors and/or tombstones) and return its path."""
+        shard_path = self._shard_path(namespace, shard)
+        shard_path.mkdir(parents=True, exist_ok=True)
+
+        if name is None:
+            with self._lock:
+                self._load_namespace(namespace)
+                sequence = self._next_segment[(namespace, shard)]
+                self._next_segment[(namespace, shard)] = sequence + 1
+            name = f"seg_{sequence:08d}"
+
+        matrix = np.asarray(matrix, dtype=np.float32).reshape(-1, self.dimension)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        matrix = matrix / np.where(norms == 0, 1.0, norms)
+
+        base = shard_path / name
+        with open(f"{base}.json", "w", encoding="utf-8") as file:
+            json.dump({
+                "ids": ids,
+                "metadata": metadata,
+                "deleted": deleted or []
+            }, file)
+
+        # The .npy file is what makes a segment visible, so publish it last
+        # and atomically.
+        tmp_path = f"{base}.npy.tmp"
+        with open(tmp_path, "wb") as file:
+            np.save(file, matrix)
+        os.replace(tmp_path, f"{base}.npy")
+        return f"{base}.npy"
+
+    def _publish(self, namespace: str, shard: int, path: str):
+        """Make a written segment visible to queries, compacting if needed."""
+        with self._lock:
+            paths = self._load_namespace(namespace)[shard]
+            paths.append(path)
+            paths.sort()
+            self.index_version += 1
+            needs_compaction = len(paths) > self.max_segments_per_shard
+
+        if needs_compaction:
+            self.compact(namespace, shard)
+
+    def upsert_vectors(self, vectors: List[Dict[str, Any]], namespace: str = "default") -> bool:
+        """Insert or update vectors in the index."""
+        if not vectors:
+            return False
+
+        try:
+            batches: Dict[int, List[Dict[str, Any]]] = {}
+            for vector in vectors:
+                batches.setdefault(self.shard_for_id(vector["id"]), []).append(vector)
+
+            for target, batch in batches.items():
+                path = self._write_segment(
+                    namespace, target,
+                    ids=[v["id"] for v in batch],
+                    metadata=[v.get("metadata", {}) for v in batch],
+                    matrix=[v["values"] for v in batch]
+                )
+                self._publish(namespace, target, path)
+
+            print(f"Upserting {len(vectors)} vectors to namespace '{namespace}' "
+                  f"across {len(batches)} shard(s)")
+            return True
+        except Exception as e:
+            print(f"Error upserting vectors: {e}")
+            return False
+
+    def delete_vectors(self, ids: List[str], namespace: str = "default") -> bool:
+        """Delete vectors by id by writing tombstones to their shards."""
+        if not ids:
+            return False
+
+        try:
+            batches: Dict[int, List[str]] = {}
+            for vector_id in ids:
+                batches.setdefault(self.shard_for_id(vector_id), []).append(vector_id)
+
+            for target, batch in batches.items():
+                path = self._write_segment(namespace, target, [], [], [], deleted=batch)
+                self._publish(namespace, target, path)
+
+            print(f"Deleting {len(ids)} vectors from namespace '{namespace}'")
+            return True
+        except Exception as e:
+            print(f"Error deleting vectors: {e}")
+            return False
+
+    def compact(self, namespace: str = "default", shard: int = None):
+        """Merge each shard's segments into one holding only its live rows.
+
+        Segments published while a compaction runs are left alone; the merged
+        segment is named after the newest segment it replaces, so it sorts
+        before them and they keep precedence.
+        """
+        shards = range(self.num_shards) if shard is None else [shard]
+        for target in shards:
+            with self._lock:
+                if (namespace, target) in self._compacting:
+                    continue
+                snapshot = list(self._load_namespace(namespace)[target])
+                if len(snapshot) < 2:
+                    continue
+                self._compacting.add((namespace, target))
+
+            try:
+                ids, metadata, rows = [], [], []
+                for path, mask in zip(snapshot, _live_masks(tuple(snapshot))):
+                    matrix, segment_ids, segment_metadata, _ = _open_segment(path)
+                    for row in np.flatnonzero(mask):
+                        ids.append(segment_ids[row])
+                        metadata.append(segment_metadata[row])
+                        rows.append(matrix[row])
+
+                # Tombstones can be dropped: nothing older than them remains
+                merged_path = self._write_segment(
+                    namespace, target, ids, metadata,
+                    matrix=np.asarray(rows, dtype=np.float32).reshape(-1, self.dimension),
+                    name=Path(snapshot[-1]).stem + "c"
+                )
+
+                with self._lock:
+                    paths = self._load_namespace(namespace)[target]
+                    paths[:len(snapshot)] = [merged_path]
+                    paths.sort()
+
+                # Queries still holding the old snapshot retry on a missing file
+                _LIVE_MASK_CACHE.pop(os.path.dirname(merged_path), None)
+                for path in snapshot:
+                    _SEGMENT_CACHE.pop(path, None)
+                    Path(path).unlink(missing_ok=True)
+                    Path(path[:-len(".npy")] + ".json").unlink(missing_ok=True)
+
+                print(f"Compacted {len(snapshot)} segments of shard {target} into {len(ids)} rows")
+            finally:
+                with self._lock:
+                    self._compacting.discard((namespace, target))
+
+    def segment_count(self, namespace: str = "default") -> int:
+        """Number of published segments across all shards of a namespace."""
+        with self._lock:
+            return sum(len(paths) for paths in self._load_namespace(namespace))
+
+    def query_vectors(self,
+                      query_embedding: List[float],
+                      top_k: int = 3,
+                      namespace: str = "default",
+                      include_metadata: bool = True,
+                      filter: Optional[Dict[str, Any]] = None) -> Optional[List[Dict[str, Any]]]:
+        """Query all shards in parallel and merge their top-k results.
+
+        Returns None if the query failed, so callers can tell a failure
+        apart from an empty result.
+        """
+        try:
+            query = np.asarray(query_embedding, dtype=np.float32)
+            norm = np.linalg.norm(query)
+            if norm > 0:
+                query = query / norm
+
+            # A compaction may delete segments of the snapshot we scattered;
+            # retry once with a fresh snapshot in that case
+            for attempt in range(2):
+                with self._lock:
+                    snapshot = [tuple(paths) for paths in self._load_namespace(namespace) if paths]
+
+                # Scatter: one task per non-empty shard
+                futures = [
+                    self._executor.submit(_query_shard, paths, query, top_k, include_metadata, filter)
+                    for paths in snapshot
+                ]
+
+                try:
+                    shard_results = [future.result() for future in futures]
+                    break
+                except FileNotFoundError:
+                    if attempt == 1:
+                        raise
+
+            # Gather: merge the per-shard top-k lists with a heap
+            merged = heapq.nlargest(
+                top_k,
+                (match for matches in shard_results for match in matches),
+                key=lambda item: item[0]
+            )
+
+            results = []
+            for score, vector_id, metadata in merged:
+                result = {"id": vector_id, "score": score}
+                if include_metadata:
+                    result["metadata"] = metadata
+                results.append(result)
+            return results
+        except Exception as e:
+            print(f"Error querying vectors: {e}")
+            return None
+
+    def vector_count(self, namespace: str = "default") -> int:
+        """Number of stored rows in a namespace (including superseded ones)."""
+        with self._lock:
+            segments = [path for paths in self._load_namespace(namespace) for path in paths]
+        return sum(_open_segment(path)[0].shape[0] for path in segments)
+
+    def close(self):
+        """Shut down the worker processes."""
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()